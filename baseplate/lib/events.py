@@ -13,7 +13,9 @@ import logging
 
 from typing import Any
 from typing import Callable
+from typing import Dict
 from typing import Generic
+from typing import Iterable
 from typing import TypeVar
 
 from thrift import TSerialization
@@ -69,6 +71,16 @@ class EventLogger:
     def log(self, **kwargs: Any) -> None:
         raise NotImplementedError
 
+    def log_batch(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Log a batch of events.
+
+        The default implementation logs each event individually. Loggers that
+        can publish more efficiently in bulk should override this.
+
+        """
+        for event in events:
+            self.log(**event)
+
 
 class DebugLogger(EventLogger):
     def __init__(self) -> None:
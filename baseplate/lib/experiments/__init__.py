@@ -1,30 +1,243 @@
 import json
 import logging
-
-from enum import Enum
+import queue
+import sys
+import threading
+import time
+import typing
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import Sequence
 from typing import Set
+from typing import Tuple
 
+from baseplate import _ExcInfo
 from baseplate import Span
+from baseplate import SpanObserver
 from baseplate.clients import ContextFactory
 from baseplate.lib import config
 from baseplate.lib.edge_context import User
 from baseplate.lib.events import DebugLogger
 from baseplate.lib.events import EventLogger
+from baseplate.lib.experiments.providers import ISO_DATE_FMT
 from baseplate.lib.experiments.providers import parse_experiment
 from baseplate.lib.experiments.providers.base import Experiment
 from baseplate.lib.file_watcher import FileWatcher
-from baseplate.lib.file_watcher import WatchedFileNotAvailableError
+
+try:
+    import orjson
+except ImportError:
+    _json_loads: Callable[[str], Any] = json.loads
+else:
+    _json_loads = orjson.loads
 
 
 logger = logging.getLogger(__name__)
 
 
-class EventType(Enum):
-    EXPOSE = "expose"
-    BUCKET = "choose"
+# Template for the per-experiment bucketing-event predicate. The experiment's
+# constant should_log_bucketing() result is inlined at compile time, fusing
+# the five do_log checks into one specialized bytecode sequence.
+_DO_LOG_SRC = (
+    "lambda bid, var, ovr, seen: "
+    "bool(bid) and var is not None and ovr is not False and not seen(bid) and SHOULD_LOG"
+)
+
+
+def _valid_until(experiment_config: Any) -> float:
+    """Return the timestamp after which a parsed experiment must be re-parsed.
+
+    :py:func:`parse_experiment` bakes the ``start_ts``/``stop_ts`` enabled
+    window into the parsed object for the legacy experiment types, so a
+    parsed experiment is only trustworthy until the next window boundary
+    passes.
+
+    """
+    if not isinstance(experiment_config, dict):
+        return float("inf")
+    start_ts = experiment_config.get("start_ts")
+    stop_ts = experiment_config.get("stop_ts")
+    if (start_ts is None or stop_ts is None) and "expires" in experiment_config:
+        # parse_experiment derives the window from the deprecated "expires"
+        # field when the explicit timestamps are missing: the experiment
+        # starts immediately and stops at the expiry date.
+        expires = datetime.strptime(experiment_config["expires"], ISO_DATE_FMT)
+        start_ts = None
+        stop_ts = (expires - datetime(1970, 1, 1)).total_seconds()
+    now = time.time()
+    if start_ts is not None and now < start_ts:
+        return start_ts
+    if stop_ts is not None and now <= stop_ts:
+        return stop_ts
+    return float("inf")
+
+
+def _make_cached_experiment(experiment: Experiment, experiment_config: Any) -> "_CachedExperiment":
+    should_log = experiment.should_log_bucketing()
+    do_log_fn = eval(  # pylint: disable=eval-used
+        compile(_DO_LOG_SRC, "<experiment do_log>", "eval"), {"SHOULD_LOG": should_log}, {}
+    )
+    return _CachedExperiment(
+        experiment=experiment,
+        should_log=should_log,
+        get_unique_id=experiment.get_unique_id,
+        do_log_fn=do_log_fn,
+        config=experiment_config,
+        valid_until=_valid_until(experiment_config),
+    )
+
+
+def _compile_experiment(name: str, experiment_config: Any) -> Optional["_CachedExperiment"]:
+    try:
+        experiment = parse_experiment(experiment_config)
+    except Exception as err:
+        logger.error("Invalid configuration for experiment %s: %s", name, err)
+        return None
+    return _make_cached_experiment(experiment, experiment_config)
+
+
+def _parse_and_compile(watched_file: IO) -> Any:
+    """Parse the watched experiments file and pre-compile every experiment.
+
+    JSON parsing uses orjson's C parser when the package is installed,
+    falling back to the stdlib otherwise.  Each experiment is then run
+    through :py:func:`parse_experiment` here, once per file change, rather
+    than lazily once per experiment per request.  Invalid entries are stored
+    as None so they are reported once rather than on every request.
+
+    """
+    data = _json_loads(watched_file.read())
+    if not isinstance(data, dict):
+        return data
+    # Interning the names here means every later dict lookup on them
+    # compares by pointer after a single hash.
+    return {
+        sys.intern(name): _compile_experiment(name, experiment_config)
+        for name, experiment_config in data.items()
+    }
+
+
+_MISSING = object()
+
+# Per-request experiment caches hold few entries, so a linear identity scan
+# over a compact list of interned names beats dict hashing; past this many
+# entries the cache falls back to a dict.
+_CACHE_SCAN_MAX = 32
+
+# Size of the per-request Bloom filter used to dedup bucketing events. 8192
+# bits (1KiB) keeps the false positive rate negligible for the hundreds of
+# experiments a single request might touch.
+_BLOOM_BITS = 8192
+
+
+class _TTLCache:
+    """A small bounded set with per-entry expiry.
+
+    Used for cross-request bucketing-event dedup: bounded so a busy process
+    cannot grow it without limit, and time-limited so a user is re-bucketed
+    eventually rather than never.  Thread-safe.
+
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expiry = self._entries.get(key)
+            if expiry is None:
+                return False
+            if expiry < now:
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, key: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = now + self._ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+# Process-wide bucketing-event dedup, shared by all Experiments instances
+# that opt in via global_dedup.
+_GLOBAL_BUCKETED = _TTLCache(maxsize=100_000, ttl=300.0)
+
+
+# Shared worker for flushing deferred experiment events off the request
+# thread, created lazily on first use.
+_flush_executor: Optional[ThreadPoolExecutor] = None
+_flush_executor_lock = threading.Lock()
+
+
+def _get_flush_executor() -> ThreadPoolExecutor:
+    global _flush_executor  # pylint: disable=global-statement
+    if _flush_executor is None:
+        with _flush_executor_lock:
+            if _flush_executor is None:
+                _flush_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="experiments-event-flush"
+                )
+    return _flush_executor
+
+
+class _EventTypeString(str):
+    """A plain string that also answers ``.value`` for Enum-style callers."""
+
+    @property
+    def value(self) -> str:
+        return str(self)
+
+
+EXPOSE_EVENT = _EventTypeString("expose")
+BUCKET_EVENT = _EventTypeString("choose")
+
+
+class EventType:
+    """Compatibility shim for the former Enum of experiment event types.
+
+    ``EventType.BUCKET`` and the module-level ``BUCKET_EVENT`` are the same
+    string; new code should use the module-level constants, which avoid the
+    Enum member-access overhead on the variant() hot path.
+
+    """
+
+    EXPOSE = EXPOSE_EVENT
+    BUCKET = BUCKET_EVENT
+
+
+class _CachedExperiment(NamedTuple):
+    """A parsed experiment plus memoized hot-path lookups.
+
+    ``should_log_bucketing()`` returns a constant per experiment, and the
+    bound ``get_unique_id`` never changes, so both are captured once at parse
+    time rather than re-dispatched on every variant() call.
+
+    """
+
+    experiment: Experiment
+    should_log: bool
+    get_unique_id: Callable[..., Optional[str]]
+    do_log_fn: Callable[..., bool]
+    config: Any
+    valid_until: float
 
 
 class ExperimentsContextFactory(ContextFactory):
@@ -41,21 +254,66 @@ class ExperimentsContextFactory(ContextFactory):
     :param timeout: How long, in seconds, to block instantiation waiting
         for the watched experiments file to become available (defaults to not
         blocking).
+    :param defer_events: If True, buffer bucketing and exposure events during
+        the request and flush them in one batch on a background thread when
+        the server span finishes, rather than logging synchronously on the
+        request path.
+    :param global_dedup: If True, dedup bucketing events across requests in
+        this process (bounded, with a five minute expiry) in addition to the
+        usual per-request dedup, so a user hitting the same experiment on
+        many requests in quick succession fires only one event.  Off by
+        default since it changes how often bucketing events are logged.
+    :param watch_mode: How to watch the experiment configuration file for
+        changes.  ``"poll"`` (the default) stats the file on every read;
+        ``"inotify"`` uses OS change notifications with a periodic stat
+        catch-up, which requires the ``inotify_simple`` package.
+    :param debounce: How long, in seconds, the configuration file must go
+        unmodified before a change is parsed, so bursts of rapid rewrites
+        are parsed once rather than per write (defaults to no debouncing).
     """
 
+    __slots__ = ("_filewatcher", "_event_logger", "_defer_events", "_global_dedup", "_pool")
+
     def __init__(
-        self, path: str, event_logger: Optional[EventLogger] = None, timeout: Optional[float] = None
+        self,
+        path: str,
+        event_logger: Optional[EventLogger] = None,
+        timeout: Optional[float] = None,
+        defer_events: bool = False,
+        global_dedup: bool = False,
+        watch_mode: str = "poll",
+        debounce: Optional[float] = None,
     ):
-        self._filewatcher = FileWatcher(path, json.load, timeout=timeout)
+        self._filewatcher = FileWatcher(
+            path,
+            _parse_and_compile,
+            timeout=timeout,
+            use_inotify=watch_mode == "inotify",
+            debounce=debounce,
+        )
         self._event_logger = event_logger
+        self._defer_events = defer_events
+        self._global_dedup = global_dedup
+        # Finished instances are recycled through this pool rather than
+        # rebuilt (and garbage collected) once per request.
+        self._pool: "queue.LifoQueue[Experiments]" = queue.LifoQueue(maxsize=64)
 
     def make_object_for_context(self, name: str, span: Span) -> "Experiments":
-        return Experiments(
-            config_watcher=self._filewatcher,
-            server_span=span,
-            context_name=name,
-            event_logger=self._event_logger,
-        )
+        try:
+            experiments = self._pool.get_nowait()
+        except queue.Empty:
+            experiments = Experiments(
+                config_watcher=self._filewatcher,
+                server_span=span,
+                context_name=name,
+                event_logger=self._event_logger,
+                defer_events=self._defer_events,
+                global_dedup=self._global_dedup,
+            )
+        else:
+            experiments._reset(span, name)  # pylint: disable=protected-access
+        span.register(_PoolReturnObserver(self._pool, experiments))
+        return experiments
 
 
 class Experiments:
@@ -68,57 +326,211 @@ class Experiments:
     active variant.
     """
 
+    # These are created per request, so avoiding a __dict__ per instance
+    # meaningfully shrinks the footprint (and slot loads are faster than
+    # dict probes on the hot attribute accesses in variant()).
+    __slots__ = (
+        "_config_watcher",
+        "_span",
+        "_context_name",
+        "_already_bucketed",
+        "_bucketed_bloom",
+        "_cache_names",
+        "_cache_exps",
+        "_cache_overflow",
+        "_bad_config_logged",
+        "_event_logger",
+        "_defer_events",
+        "_global_dedup",
+        "_pending_events",
+    )
+
     def __init__(
         self,
         config_watcher: FileWatcher,
         server_span: Span,
         context_name: str,
         event_logger: Optional[EventLogger] = None,
+        defer_events: bool = False,
+        global_dedup: bool = False,
     ):
         self._config_watcher = config_watcher
         self._span = server_span
         self._context_name = context_name
-        self._already_bucketed: Set[str] = set()
-        self._experiment_cache: Dict[str, Optional[Experiment]] = {}
+        self._already_bucketed: Set[int] = set()
+        self._bucketed_bloom = bytearray(_BLOOM_BITS // 8)
+        # Parallel lists scanned by identity; _cache_overflow takes over if
+        # a request somehow touches more than _CACHE_SCAN_MAX experiments.
+        self._cache_names: List[str] = []
+        self._cache_exps: List[Optional[_CachedExperiment]] = []
+        self._cache_overflow: Optional[Dict[str, Optional[_CachedExperiment]]] = None
+        self._bad_config_logged = False
         if event_logger:
             self._event_logger = event_logger
         else:
             self._event_logger = DebugLogger()
+        self._defer_events = defer_events
+        self._global_dedup = global_dedup
+        self._pending_events: List[Dict[str, Any]] = []
+        if defer_events:
+            server_span.register(_EventFlushObserver(self))
 
-    def _get_config(self, name: str) -> Optional[Dict[str, str]]:
-        try:
-            config_data = self._config_watcher.get_data()
-            return config_data[name]
-        except WatchedFileNotAvailableError as exc:
-            logger.warning("Experiment config unavailable: %s", str(exc))
-        except KeyError:
-            logger.warning("Experiment <%r> not found in experiment config", name)
-        except TypeError as exc:
-            logger.warning("Could not load experiment config: %s", str(exc))
-        return None
+    def _reset(self, server_span: Span, context_name: str) -> None:
+        """Prepare a recycled instance to serve a new request.
+
+        Clears all per-request state while keeping the existing containers
+        (and their allocations) alive.
 
-    def _get_experiment(self, name: str) -> Optional[Experiment]:
-        if name not in self._experiment_cache:
-            experiment_config = self._get_config(name)
-            if not experiment_config:
-                experiment = None
-            else:
-                try:
-                    experiment = parse_experiment(experiment_config)
-                except Exception as err:
-                    logger.error("Invalid configuration for experiment %s: %s", name, err)
-                    return None
-            self._experiment_cache[name] = experiment
-        return self._experiment_cache[name]
-
-    def get_all_experiment_names(self) -> Sequence[str]:
-        """Return a list of all valid experiment names from the configuration file.
-
-        :return: List of all valid experiment names.
         """
-        cfg = self._config_watcher.get_data()
-        experiment_names = list(cfg.keys())
-        return experiment_names
+        self._span = server_span
+        self._context_name = context_name
+        self._already_bucketed.clear()
+        self._bucketed_bloom[:] = bytes(len(self._bucketed_bloom))
+        self._cache_names.clear()
+        self._cache_exps.clear()
+        self._cache_overflow = None
+        self._bad_config_logged = False
+        self._pending_events.clear()
+        if self._defer_events:
+            server_span.register(_EventFlushObserver(self))
+
+    def _get_config(self, name: str) -> Optional[Any]:
+        config_data = self._config_watcher.get_data_or_none()
+        if config_data is None:
+            return None
+
+        if not isinstance(config_data, dict):
+            if not self._bad_config_logged:
+                logger.warning(
+                    "Could not load experiment config: expected a mapping, got %s",
+                    type(config_data).__name__,
+                )
+                self._bad_config_logged = True
+            return None
+
+        experiment_config = config_data.get(name)
+        if experiment_config is None:
+            logger.debug("Experiment <%r> not found in experiment config", name)
+        return experiment_config
+
+    def _get_experiment(self, name: str) -> Optional[_CachedExperiment]:
+        # Experiment names come from a small fixed vocabulary (usually string
+        # literals at call sites), so interning is cheap and makes the cache
+        # and config lookups below pointer comparisons.
+        name = sys.intern(name)
+        overflow = self._cache_overflow
+        if overflow is not None:
+            cached = overflow.get(name, _MISSING)
+            if cached is not _MISSING:
+                return typing.cast(Optional[_CachedExperiment], cached)
+        else:
+            for i, cached_name in enumerate(self._cache_names):
+                if cached_name is name:
+                    return self._cache_exps[i]
+
+        experiment_config = self._get_config(name)
+        if not experiment_config:
+            cached = None
+        elif isinstance(experiment_config, _CachedExperiment):
+            # The experiment was pre-compiled when the config file was
+            # parsed; no per-request parse work is needed unless the
+            # experiment's enabled window has hit a boundary since then, in
+            # which case it is re-parsed so experiments start and stop on
+            # schedule even while the file is unchanged.
+            cached = experiment_config
+            if time.time() >= cached.valid_until:
+                cached = _compile_experiment(name, cached.config)
+        else:
+            # Raw configuration from a watcher without the pre-compiling
+            # parser; parse lazily as before.
+            try:
+                experiment = parse_experiment(experiment_config)
+            except Exception as err:
+                logger.error("Invalid configuration for experiment %s: %s", name, err)
+                return None
+            cached = _make_cached_experiment(experiment, experiment_config)
+        self._cache_experiment(name, cached)
+        return cached
+
+    def _cache_experiment(self, name: str, cached: Optional[_CachedExperiment]) -> None:
+        if self._cache_overflow is not None:
+            self._cache_overflow[name] = cached
+        elif len(self._cache_names) < _CACHE_SCAN_MAX:
+            self._cache_names.append(name)
+            self._cache_exps.append(cached)
+        else:
+            self._cache_overflow = dict(zip(self._cache_names, self._cache_exps))
+            self._cache_overflow[name] = cached
+
+    def _was_bucketed(self, bucketing_id: str) -> bool:
+        """Return whether a bucketing event was already logged for this id.
+
+        A Bloom filter answers the common "never seen" case with two bit
+        tests; only a Bloom hit falls through to the exact set.  The set
+        holds 64-bit hashes of the ids rather than the id strings
+        themselves: eight bytes per entry instead of a retained composite
+        key, at a ~2^-64 collision rate that at worst drops one duplicate
+        bucketing event.
+
+        """
+        bkey = hash(bucketing_id)
+        i1 = bkey & (_BLOOM_BITS - 1)
+        i2 = (bkey >> 13) & (_BLOOM_BITS - 1)
+        bloom = self._bucketed_bloom
+        if bloom[i1 >> 3] & (1 << (i1 & 7)) and bloom[i2 >> 3] & (1 << (i2 & 7)):
+            if bkey in self._already_bucketed:
+                return True
+        if self._global_dedup:
+            return bkey in _GLOBAL_BUCKETED
+        return False
+
+    def _mark_bucketed(self, bucketing_id: str) -> None:
+        bkey = hash(bucketing_id)
+        i1 = bkey & (_BLOOM_BITS - 1)
+        i2 = (bkey >> 13) & (_BLOOM_BITS - 1)
+        bloom = self._bucketed_bloom
+        bloom[i1 >> 3] |= 1 << (i1 & 7)
+        bloom[i2 >> 3] |= 1 << (i2 & 7)
+        self._already_bucketed.add(bkey)
+        if self._global_dedup:
+            _GLOBAL_BUCKETED.add(bkey)
+
+    def _log_event(self, event: Dict[str, Any]) -> None:
+        if self._defer_events:
+            self._pending_events.append(event)
+        else:
+            self._event_logger.log(**event)
+
+    def _flush_events(self) -> Optional["Future[None]"]:
+        """Hand any deferred events to the background flush worker.
+
+        Returns the future for the flush, or None if nothing was pending.
+
+        """
+        events, self._pending_events = self._pending_events, []
+        if not events:
+            return None
+
+        event_logger = self._event_logger
+        log_batch = getattr(event_logger, "log_batch", None)
+        if log_batch is not None:
+            return _get_flush_executor().submit(log_batch, events)
+
+        def _log_all() -> None:
+            for event in events:
+                event_logger.log(**event)
+
+        return _get_flush_executor().submit(_log_all)
+
+    def get_all_experiment_names(self) -> Iterable[str]:
+        """Return all experiment names from the configuration file.
+
+        :return: A view of all experiment names.  The view reflects the
+            configuration at the time of the call; copy it with
+            :py:func:`list` if you need a snapshot that outlives a
+            configuration reload.
+        """
+        return self._config_watcher.get_data().keys()
 
     def is_valid_experiment(self, name: str) -> bool:
         """Return true if the provided experiment name is a valid experiment.
@@ -177,52 +589,127 @@ class Experiments:
 
         :return: Variant name if a variant is active, None otherwise.
         """
-        experiment = self._get_experiment(name)
+        # kwargs is a fresh dict owned by this call, so it only needs copying
+        # when user fields are merged in.
+        if user:
+            inputs: Dict[str, Any] = {**kwargs, **user.event_fields()}
+        else:
+            inputs = kwargs
 
-        if experiment is None:
-            return None
+        variant, event = self._variant_with_inputs(name, inputs, bucketing_event_override)
+
+        if event is not None:
+            self._log_event(event)
+
+        return variant
+
+    def variants(
+        self,
+        names: Sequence[str],
+        user: Optional[User] = None,
+        bucketing_event_override: Optional[bool] = None,
+        **kwargs: str,
+    ) -> Dict[str, Optional[str]]:
+        """Return the active variant, if any, for each of the named experiments.
 
-        inputs = dict(kwargs)
+        This is a batched version of :py:meth:`variant` for callers that need
+        to check many experiments in one request.  The experiment inputs
+        (``kwargs`` and the user's event fields) are assembled once and shared
+        across all checks, and any bucketing events are logged in a single
+        batch rather than one at a time.
 
+        The bucketing event semantics are identical to calling
+        :py:meth:`variant` once per name, in order.
+
+        :param names: Names of the experiments you want to run.
+        :param user: User object for the user you want to check the experiment
+            variants for.  See :py:meth:`variant`.
+        :param bucketing_event_override: Set if you need to override the
+            default behavior for sending bucketing events.  Applies to all of
+            the named experiments.  See :py:meth:`variant`.
+        :param kwargs: Arguments that will be passed to each experiment to
+            determine bucketing, targeting, and overrides.
+
+        :return: A mapping of experiment name to variant name, with None for
+            experiments that are inactive or unknown.
+        """
         if user:
-            inputs.update(user.event_fields())
+            inputs: Dict[str, Any] = {**kwargs, **user.event_fields()}
+        else:
+            inputs = kwargs
+
+        variants: Dict[str, Optional[str]] = {}
+        events = []
+        for name in names:
+            variant, event = self._variant_with_inputs(name, inputs, bucketing_event_override)
+            variants[name] = variant
+            if event is not None:
+                events.append(event)
+
+        if events:
+            if self._defer_events:
+                self._pending_events.extend(events)
+            else:
+                log_batch = getattr(self._event_logger, "log_batch", None)
+                if log_batch is not None:
+                    log_batch(events)
+                else:
+                    for event in events:
+                        self._event_logger.log(**event)
 
-        variant = experiment.variant(**inputs)
+        return variants
 
-        bucketing_id = experiment.get_unique_id(**inputs)
+    def _variant_with_inputs(
+        self,
+        name: str,
+        inputs: Dict[str, Any],
+        bucketing_event_override: Optional[bool] = None,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Determine the active variant and build the bucketing event, if any.
 
-        do_log = True
+        Returns the variant name and the keyword arguments for the bucketing
+        event that should be logged, or None if no event is due.  The caller
+        is responsible for actually logging the event; this allows batch
+        callers to log many events at once.
 
-        if not bucketing_id:
-            do_log = False
+        """
+        cached = self._get_experiment(name)
 
-        if variant is None:
-            do_log = False
+        if cached is None:
+            return None, None
 
-        if bucketing_event_override is False:
-            do_log = False
+        experiment = cached.experiment
 
-        if bucketing_id and bucketing_id in self._already_bucketed:
-            do_log = False
+        variant = experiment.variant(**inputs)
 
-        do_log = do_log and experiment.should_log_bucketing()
+        # When no event can possibly be logged, return before computing the
+        # bucketing id at all -- get_unique_id typically concatenates and
+        # hashes strings, which is pure waste on the miss path.
+        if variant is None or bucketing_event_override is False or not cached.should_log:
+            return variant, None
 
-        if do_log:
-            assert bucketing_id
-            self._event_logger.log(
-                experiment=experiment,
-                variant=variant,
-                user_id=inputs.get("user_id"),
-                logged_in=inputs.get("logged_in"),
-                cookie_created_timestamp=inputs.get("cookie_created_timestamp"),
-                app_name=inputs.get("app_name"),
-                event_type=EventType.BUCKET,
-                inputs=inputs,
-                span=self._span,
-            )
-            self._already_bucketed.add(bucketing_id)
+        bucketing_id = cached.get_unique_id(**inputs)
 
-        return variant
+        if not cached.do_log_fn(
+            bucketing_id, variant, bucketing_event_override, self._was_bucketed
+        ):
+            return variant, None
+
+        assert bucketing_id
+        self._mark_bucketed(bucketing_id)
+        inputs_get = inputs.get
+        event = dict(
+            experiment=experiment,
+            variant=variant,
+            user_id=inputs_get("user_id"),
+            logged_in=inputs_get("logged_in"),
+            cookie_created_timestamp=inputs_get("cookie_created_timestamp"),
+            app_name=inputs_get("app_name"),
+            event_type=BUCKET_EVENT,
+            inputs=inputs,
+            span=self._span,
+        )
+        return variant, event
 
     def expose(
         self, experiment_name: str, variant_name: str, user: Optional[User] = None, **kwargs: str
@@ -237,29 +724,63 @@ class Experiments:
         :param kwargs: Additional arguments that will be passed to logger.
 
         """
-        experiment = self._get_experiment(experiment_name)
+        cached = self._get_experiment(experiment_name)
 
-        if experiment is None:
+        if cached is None:
             return
 
-        inputs = dict(kwargs)
-
         if user:
-            inputs.update(user.event_fields())
-
-        self._event_logger.log(
-            experiment=experiment,
-            variant=variant_name,
-            user_id=inputs.get("user_id"),
-            logged_in=inputs.get("logged_in"),
-            cookie_created_timestamp=inputs.get("cookie_created_timestamp"),
-            app_name=inputs.get("app_name"),
-            event_type=EventType.EXPOSE,
-            inputs=inputs,
-            span=self._span,
+            inputs: Dict[str, Any] = {**kwargs, **user.event_fields()}
+        else:
+            inputs = kwargs
+
+        inputs_get = inputs.get
+        self._log_event(
+            dict(
+                experiment=cached.experiment,
+                variant=variant_name,
+                user_id=inputs_get("user_id"),
+                logged_in=inputs_get("logged_in"),
+                cookie_created_timestamp=inputs_get("cookie_created_timestamp"),
+                app_name=inputs_get("app_name"),
+                event_type=EXPOSE_EVENT,
+                inputs=inputs,
+                span=self._span,
+            )
         )
 
 
+class _EventFlushObserver(SpanObserver):
+    """Flush an Experiments client's deferred events when its span finishes."""
+
+    def __init__(self, experiments: Experiments):
+        self._experiments = experiments
+
+    def on_finish(self, exc_info: Optional[_ExcInfo]) -> None:
+        self._experiments._flush_events()  # pylint: disable=protected-access
+
+
+class _PoolReturnObserver(SpanObserver):
+    """Return an Experiments instance to its factory's pool at span end.
+
+    Deferred events are handled by the :py:class:`_EventFlushObserver` the
+    instance registers for itself, which runs first since observers run in
+    registration order, so the instance is always flushed by the time it
+    goes back in the pool.
+
+    """
+
+    def __init__(self, pool: "queue.LifoQueue[Experiments]", experiments: Experiments):
+        self._pool = pool
+        self._experiments = experiments
+
+    def on_finish(self, exc_info: Optional[_ExcInfo]) -> None:
+        try:
+            self._pool.put_nowait(self._experiments)
+        except queue.Full:
+            pass
+
+
 def experiments_client_from_config(
     app_config: config.RawConfig, event_logger: EventLogger, prefix: str = "experiments."
 ) -> ExperimentsContextFactory:
@@ -274,6 +795,16 @@ def experiments_client_from_config(
         experiment configuration fetcher daemon.
     ``timeout`` (optional): the time that we should wait for the file specified by
         ``path`` to exist.  Defaults to `None` which is `infinite`.
+    ``defer_events`` (optional): whether to buffer bucketing and exposure
+        events and flush them in one batch off the request path when the
+        server span finishes.  Defaults to ``false``.
+    ``global_dedup`` (optional): whether to dedup bucketing events across
+        requests within this process rather than only within each request.
+        Defaults to ``false``.
+    ``watch_mode`` (optional): how to watch the configuration file for
+        changes, either ``poll`` or ``inotify``.  Defaults to ``poll``.
+    ``debounce`` (optional): how long the configuration file must go
+        unmodified before a change is parsed.  Defaults to no debouncing.
 
     :param raw_config: The application configuration which should have
         settings for the experiments client.
@@ -290,6 +821,12 @@ def experiments_client_from_config(
             config_prefix: {
                 "path": config.Optional(config.String, default="/var/local/experiments.json"),
                 "timeout": config.Optional(config.Timespan),
+                "defer_events": config.Optional(config.Boolean, default=False),
+                "global_dedup": config.Optional(config.Boolean, default=False),
+                "watch_mode": config.Optional(
+                    config.OneOf(poll="poll", inotify="inotify"), default="poll"
+                ),
+                "debounce": config.Optional(config.Timespan),
             }
         },
     )
@@ -301,4 +838,17 @@ def experiments_client_from_config(
     else:
         timeout = None
 
-    return ExperimentsContextFactory(options.path, event_logger, timeout=timeout)
+    if options.debounce:
+        debounce = options.debounce.total_seconds()
+    else:
+        debounce = None
+
+    return ExperimentsContextFactory(
+        options.path,
+        event_logger,
+        timeout=timeout,
+        defer_events=options.defer_events,
+        global_dedup=options.global_dedup,
+        watch_mode=options.watch_mode,
+        debounce=debounce,
+    )
@@ -31,6 +31,7 @@ would change whenever the underlying file changes.
 """
 import logging
 import os
+import time
 import typing
 
 from typing import Callable
@@ -44,9 +45,19 @@ from typing import Union
 
 from baseplate.lib.retry import RetryPolicy
 
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
 
 logger = logging.getLogger(__name__)
 
+# How often, in seconds, to fall back to a stat() check when using inotify.
+# inotify can miss events on NFS and some container bind mounts, so we
+# periodically double-check the mtime rather than trusting it absolutely.
+INOTIFY_CATCHUP_INTERVAL = 30.0
+
 
 class _NOT_LOADED:
     pass
@@ -89,6 +100,18 @@ class FileWatcher(Generic[T]):
     :param newline: Controls how universal newlines mode works
         (it only applies to text mode). It can be `None`, `""`, `"\\n"`, `"\\r"`,
         and `"\\r\\n"`.  This is not supported if `binary` is set to `True`.
+    :param use_inotify: Use OS file-change notifications rather than calling
+        :py:func:`os.path.getmtime` on every read.  A periodic ``stat()``
+        check is retained as a catch-up for filesystems where inotify misses
+        events.  Silently falls back to mtime polling if the
+        ``inotify_simple`` package is not installed or the watch cannot be
+        established.
+    :param debounce: How long, in seconds, the file must go unmodified
+        before a change is picked up.  When the file is rewritten several
+        times in quick succession (e.g. partial writes from a fetcher
+        daemon) this parses the final contents once instead of parsing each
+        intermediate version.  The previously loaded data is served in the
+        meantime.  Defaults to no debouncing.
 
     """
 
@@ -100,6 +123,8 @@ class FileWatcher(Generic[T]):
         binary: bool = False,
         encoding: Optional[str] = None,
         newline: Optional[str] = None,
+        use_inotify: bool = False,
+        debounce: Optional[float] = None,
     ):
         if binary and encoding is not None:
             raise TypeError("'encoding' is not supported in binary mode.")
@@ -115,6 +140,30 @@ class FileWatcher(Generic[T]):
             mode="rb" if binary else "r", encoding=encoding, newline=newline
         )
 
+        self._debounce = debounce
+        self._change_pending = False
+        self._inotify = None
+        self._last_catchup = 0.0
+        if use_inotify:
+            if inotify_simple is None:
+                logger.warning(
+                    "%s: inotify_simple is not available, falling back to mtime polling.", path
+                )
+            else:
+                try:
+                    inotify = inotify_simple.INotify()
+                    watch_flags = inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.MOVED_TO
+                    inotify.add_watch(os.path.dirname(path) or ".", watch_flags)
+                except OSError as exc:
+                    logger.warning(
+                        "%s: could not establish inotify watch (%s), "
+                        "falling back to mtime polling.",
+                        path,
+                        exc,
+                    )
+                else:
+                    self._inotify = inotify
+
         if timeout is not None:
             last_error = None
             for _ in RetryPolicy.new(budget=timeout, backoff=0.01):
@@ -135,6 +184,35 @@ class FileWatcher(Generic[T]):
                     self._path, f"timed out. last error was: {last_error.inner}"
                 )
 
+    def _may_have_changed(self) -> bool:
+        """Check the inotify watch for changes to the watched file.
+
+        Returns True when the file needs a ``stat()`` check: an inotify event
+        arrived for it, the periodic catch-up interval elapsed, or no data
+        has been loaded yet.
+
+        """
+        assert self._inotify is not None
+
+        if self._data is _NOT_LOADED:
+            return True
+
+        try:
+            events = self._inotify.read(timeout=0)
+        except OSError:
+            return True
+
+        basename = os.path.basename(self._path)
+        if any(event.name == basename for event in events):
+            return True
+
+        now = time.monotonic()
+        if now - self._last_catchup >= INOTIFY_CATCHUP_INTERVAL:
+            self._last_catchup = now
+            return True
+
+        return False
+
     def get_data(self) -> T:
         """Return the current contents of the file, parsed.
 
@@ -148,6 +226,9 @@ class FileWatcher(Generic[T]):
         the freshest data.
 
         """
+        if self._inotify is not None and not self._change_pending and not self._may_have_changed():
+            return typing.cast(T, self._data)
+
         try:
             current_mtime = os.path.getmtime(self._path)
         except OSError as exc:
@@ -156,6 +237,19 @@ class FileWatcher(Generic[T]):
             return typing.cast(T, self._data)
 
         if self._mtime < current_mtime:
+            if (
+                self._debounce is not None
+                and self._data is not _NOT_LOADED
+                and time.time() - current_mtime < self._debounce
+            ):
+                # The file was modified very recently and may still be mid
+                # rewrite. Keep serving the cached data; a later call will
+                # pick up the final contents once the file has quiesced.
+                # Remember that a reload is due: the inotify event for this
+                # change has already been consumed, so without this flag the
+                # deferred reload would wait for the periodic catch-up.
+                self._change_pending = True
+                return typing.cast(T, self._data)
             logger.debug("Loading %s.", self._path)
             try:
                 with open(self._path, **self._open_options._asdict()) as f:
@@ -165,5 +259,21 @@ class FileWatcher(Generic[T]):
                     raise WatchedFileNotAvailableError(self._path, exc)
                 logger.warning("%s: failed to load, using cached data: %s", self._path, exc)
             self._mtime = current_mtime
+            self._change_pending = False
 
         return typing.cast(T, self._data)
+
+    def get_data_or_none(self) -> Optional[T]:
+        """Return the current contents of the file, or None if unavailable.
+
+        Like :py:meth:`get_data` but returns :py:data:`None` rather than
+        raising :py:exc:`WatchedFileNotAvailableError` when the file has
+        never been loadable, for callers that treat missing data as a soft
+        failure on a hot path.
+
+        """
+        try:
+            return self.get_data()
+        except WatchedFileNotAvailableError as exc:
+            logger.warning("%s: watched file unavailable: %s", self._path, exc.inner)
+            return None
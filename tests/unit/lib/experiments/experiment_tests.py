@@ -9,6 +9,7 @@ from baseplate import ServerSpan
 from baseplate.lib.edge_context import AuthenticationToken
 from baseplate.lib.edge_context import User
 from baseplate.lib.events import DebugLogger
+from baseplate.lib.experiments import _parse_and_compile
 from baseplate.lib.experiments import EventType
 from baseplate.lib.experiments import Experiments
 from baseplate.lib.experiments import experiments_client_from_config
@@ -25,6 +26,14 @@ class TestExperiments(unittest.TestCase):
         super().setUp()
         self.event_logger = mock.Mock(spec=DebugLogger)
         self.mock_filewatcher = mock.Mock(spec=FileWatcher)
+
+        def get_data_or_none():
+            try:
+                return self.mock_filewatcher.get_data()
+            except WatchedFileNotAvailableError:
+                return None
+
+        self.mock_filewatcher.get_data_or_none.side_effect = get_data_or_none
         self.mock_span = mock.MagicMock(spec=ServerSpan)
         self.mock_span.context = None
         self.mock_span.trace_id = "123456"
@@ -160,6 +169,272 @@ class TestExperiments(unittest.TestCase):
             experiments.variant("test", user=self.user)
             self.assertEqual(self.event_logger.log.call_count, 1)
 
+    def test_variants_batch(self):
+        experiment_config = {
+            "id": 1,
+            "name": "test",
+            "owner": "test",
+            "type": "r2",
+            "version": "1",
+            "start_ts": time.time() - THIRTY_DAYS,
+            "stop_ts": time.time() + THIRTY_DAYS,
+            "experiment": {
+                "id": 1,
+                "name": "test",
+                "variants": {"active": 10, "control_1": 10, "control_2": 10},
+            },
+        }
+        self.mock_filewatcher.get_data.return_value = {
+            "test": experiment_config,
+            "test2": dict(experiment_config, id=2, name="test2"),
+        }
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+        )
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ):
+            variants = experiments.variants(["test", "test2", "unknown"], user=self.user)
+            self.assertEqual(variants, {"test": "active", "test2": "active", "unknown": None})
+            self.assertEqual(self.event_logger.log.call_count, 0)
+            self.assertEqual(self.event_logger.log_batch.call_count, 1)
+            events = self.event_logger.log_batch.call_args[0][0]
+            self.assertEqual(len(events), 2)
+            self.assertEqual(events[0]["variant"], "active")
+            self.assertEqual(events[0]["user_id"], "t2_1")
+            self.assertEqual(events[0]["event_type"], EventType.BUCKET)
+
+    def test_variants_batch_deduplicates_bucketing_events(self):
+        self.mock_filewatcher.get_data.return_value = {
+            "test": {
+                "id": 1,
+                "name": "test",
+                "owner": "test",
+                "type": "r2",
+                "version": "1",
+                "start_ts": time.time() - THIRTY_DAYS,
+                "stop_ts": time.time() + THIRTY_DAYS,
+                "experiment": {
+                    "id": 1,
+                    "name": "test",
+                    "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                },
+            }
+        }
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+        )
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ):
+            experiments.variant("test", user=self.user)
+            self.assertEqual(self.event_logger.log.call_count, 1)
+            experiments.variants(["test"], user=self.user)
+            self.assertEqual(self.event_logger.log.call_count, 1)
+            self.assertEqual(self.event_logger.log_batch.call_count, 0)
+
+    def test_defer_events_buffers_until_span_finish(self):
+        self.mock_filewatcher.get_data.return_value = {
+            "test": {
+                "id": 1,
+                "name": "test",
+                "owner": "test",
+                "type": "r2",
+                "version": "1",
+                "start_ts": time.time() - THIRTY_DAYS,
+                "stop_ts": time.time() + THIRTY_DAYS,
+                "experiment": {
+                    "id": 1,
+                    "name": "test",
+                    "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                },
+            }
+        }
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+            defer_events=True,
+        )
+        self.mock_span.register.assert_called_once()
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ):
+            experiments.variant("test", user=self.user)
+            experiments.expose("test", variant_name="active", user=self.user)
+        self.assertEqual(self.event_logger.log.call_count, 0)
+        self.assertEqual(self.event_logger.log_batch.call_count, 0)
+
+        future = experiments._flush_events()
+        future.result(timeout=5)
+        self.assertEqual(self.event_logger.log_batch.call_count, 1)
+        events = self.event_logger.log_batch.call_args[0][0]
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0]["event_type"], EventType.BUCKET)
+        self.assertEqual(events[1]["event_type"], EventType.EXPOSE)
+
+    def test_precompiled_config(self):
+        from io import StringIO
+
+        config_json = json.dumps(
+            {
+                "test": {
+                    "id": 1,
+                    "name": "test",
+                    "owner": "test",
+                    "type": "r2",
+                    "version": "1",
+                    "start_ts": time.time() - THIRTY_DAYS,
+                    "stop_ts": time.time() + THIRTY_DAYS,
+                    "experiment": {
+                        "id": 1,
+                        "name": "test",
+                        "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                    },
+                },
+                "invalid": {"id": 2, "name": "invalid"},
+            }
+        )
+        self.mock_filewatcher.get_data.return_value = _parse_and_compile(StringIO(config_json))
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+        )
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ), mock.patch("baseplate.lib.experiments.parse_experiment") as parse_mock:
+            variant = experiments.variant("test", user=self.user)
+            self.assertEqual(variant, "active")
+            self.assertEqual(self.event_logger.log.call_count, 1)
+            self.assertEqual(parse_mock.call_count, 0)
+
+        self.assertFalse(experiments.is_valid_experiment("invalid"))
+
+    def test_precompiled_config_rechecks_time_window(self):
+        from io import StringIO
+
+        stop_ts = time.time() + THIRTY_DAYS
+        config_json = json.dumps(
+            {
+                "test": {
+                    "id": 1,
+                    "name": "test",
+                    "owner": "test",
+                    "type": "r2",
+                    "version": "1",
+                    "start_ts": time.time() - THIRTY_DAYS,
+                    "stop_ts": stop_ts,
+                    "experiment": {
+                        "id": 1,
+                        "name": "test",
+                        "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                    },
+                }
+            }
+        )
+        self.mock_filewatcher.get_data.return_value = _parse_and_compile(StringIO(config_json))
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+        )
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ), mock.patch("time.time", return_value=stop_ts + 1):
+            self.assertIsNone(experiments.variant("test", user=self.user))
+        self.assertEqual(self.event_logger.log.call_count, 0)
+
+    def test_precompiled_expires_config_rechecks_time_window(self):
+        from datetime import datetime
+        from io import StringIO
+
+        expires = datetime.utcfromtimestamp(time.time() + THIRTY_DAYS)
+        config_json = json.dumps(
+            {
+                "test": {
+                    "id": 1,
+                    "name": "test",
+                    "owner": "test",
+                    "type": "r2",
+                    "version": "1",
+                    "expires": expires.strftime("%Y-%m-%d"),
+                    "experiment": {
+                        "id": 1,
+                        "name": "test",
+                        "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                    },
+                }
+            }
+        )
+        self.mock_filewatcher.get_data.return_value = _parse_and_compile(StringIO(config_json))
+        experiments = Experiments(
+            config_watcher=self.mock_filewatcher,
+            server_span=self.mock_span,
+            context_name="test",
+            event_logger=self.event_logger,
+        )
+
+        with mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ), mock.patch("time.time", return_value=time.time() + 2 * THIRTY_DAYS):
+            self.assertIsNone(experiments.variant("test", user=self.user))
+        self.assertEqual(self.event_logger.log.call_count, 0)
+
+    def test_global_dedup_spans_requests(self):
+        from baseplate.lib.experiments import _TTLCache
+
+        self.mock_filewatcher.get_data.return_value = {
+            "test": {
+                "id": 1,
+                "name": "test",
+                "owner": "test",
+                "type": "r2",
+                "version": "1",
+                "start_ts": time.time() - THIRTY_DAYS,
+                "stop_ts": time.time() + THIRTY_DAYS,
+                "experiment": {
+                    "id": 1,
+                    "name": "test",
+                    "variants": {"active": 10, "control_1": 10, "control_2": 10},
+                },
+            }
+        }
+
+        def make_experiments():
+            return Experiments(
+                config_watcher=self.mock_filewatcher,
+                server_span=self.mock_span,
+                context_name="test",
+                event_logger=self.event_logger,
+                global_dedup=True,
+            )
+
+        with mock.patch(
+            "baseplate.lib.experiments._GLOBAL_BUCKETED", _TTLCache(maxsize=100, ttl=300.0)
+        ), mock.patch(
+            "baseplate.lib.experiments.providers.r2.R2Experiment.variant", return_value="active"
+        ):
+            make_experiments().variant("test", user=self.user)
+            self.assertEqual(self.event_logger.log.call_count, 1)
+            # a fresh instance simulating the next request for the same user
+            make_experiments().variant("test", user=self.user)
+            self.assertEqual(self.event_logger.log.call_count, 1)
+
     def test_exposure_event_fields(self):
         self.mock_filewatcher.get_data.return_value = {
             "test": {
@@ -404,7 +679,7 @@ class TestExperiments(unittest.TestCase):
         self.assertEqual(self.event_logger.log.call_count, 0)
 
     def test_that_bucketing_events_not_sent_if_cant_parse_config(self):
-        self.mock_filewatcher.get_data.side_effect = TypeError()
+        self.mock_filewatcher.get_data.return_value = "not a mapping"
         experiments = Experiments(
             config_watcher=self.mock_filewatcher,
             server_span=self.mock_span,
@@ -517,6 +792,36 @@ class TestExperiments(unittest.TestCase):
         self.assertEqual(variant, None)
 
 
+class ExperimentsContextFactoryPoolTests(unittest.TestCase):
+    def test_instances_are_recycled_between_requests(self):
+        with mock.patch("baseplate.lib.experiments.FileWatcher"):
+            factory = ExperimentsContextFactory("/tmp/test", mock.Mock(spec=DebugLogger))
+
+        span1 = mock.MagicMock(spec=ServerSpan)
+        experiments = factory.make_object_for_context("experiments", span1)
+        experiments._mark_bucketed("bucketing_id")
+        self.assertTrue(experiments._was_bucketed("bucketing_id"))
+
+        observer = span1.register.call_args[0][0]
+        observer.on_finish(None)
+
+        span2 = mock.MagicMock(spec=ServerSpan)
+        recycled = factory.make_object_for_context("experiments", span2)
+        self.assertIs(recycled, experiments)
+        self.assertIs(recycled._span, span2)
+        self.assertFalse(recycled._was_bucketed("bucketing_id"))
+
+    def test_new_instance_when_pool_empty(self):
+        with mock.patch("baseplate.lib.experiments.FileWatcher"):
+            factory = ExperimentsContextFactory("/tmp/test", mock.Mock(spec=DebugLogger))
+
+        span1 = mock.MagicMock(spec=ServerSpan)
+        span2 = mock.MagicMock(spec=ServerSpan)
+        first = factory.make_object_for_context("experiments", span1)
+        second = factory.make_object_for_context("experiments", span2)
+        self.assertIsNot(first, second)
+
+
 @mock.patch("baseplate.lib.experiments.FileWatcher")
 class ExperimentsClientFromConfigTests(unittest.TestCase):
     def test_make_clients(self, file_watcher_mock):
@@ -525,7 +830,9 @@ class ExperimentsClientFromConfigTests(unittest.TestCase):
             {"experiments.path": "/tmp/test"}, event_logger
         )
         self.assertIsInstance(experiments, ExperimentsContextFactory)
-        file_watcher_mock.assert_called_once_with("/tmp/test", json.load, timeout=None)
+        file_watcher_mock.assert_called_once_with(
+            "/tmp/test", _parse_and_compile, timeout=None, use_inotify=False, debounce=None
+        )
 
     def test_timeout(self, file_watcher_mock):
         event_logger = mock.Mock(spec=DebugLogger)
@@ -533,7 +840,9 @@ class ExperimentsClientFromConfigTests(unittest.TestCase):
             {"experiments.path": "/tmp/test", "experiments.timeout": "60 seconds"}, event_logger
         )
         self.assertIsInstance(experiments, ExperimentsContextFactory)
-        file_watcher_mock.assert_called_once_with("/tmp/test", json.load, timeout=60.0)
+        file_watcher_mock.assert_called_once_with(
+            "/tmp/test", _parse_and_compile, timeout=60.0, use_inotify=False, debounce=None
+        )
 
     def test_prefix(self, file_watcher_mock):
         event_logger = mock.Mock(spec=DebugLogger)
@@ -543,4 +852,6 @@ class ExperimentsClientFromConfigTests(unittest.TestCase):
             prefix="r2_experiments.",
         )
         self.assertIsInstance(experiments, ExperimentsContextFactory)
-        file_watcher_mock.assert_called_once_with("/tmp/test", json.load, timeout=60.0)
+        file_watcher_mock.assert_called_once_with(
+            "/tmp/test", _parse_and_compile, timeout=60.0, use_inotify=False, debounce=None
+        )
@@ -50,6 +50,7 @@ class TestFeatureFlag(unittest.TestCase):
                 },
             }
         }
+        filewatcher.get_data_or_none.return_value = filewatcher.get_data.return_value
         experiments = Experiments(config_watcher=filewatcher, server_span=span, context_name="test")
         self.assertEqual(event_queue.put.call_count, 0)
         variant = experiments.variant("test", user_id=self.user_id, logged_in=True)
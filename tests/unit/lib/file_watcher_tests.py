@@ -3,6 +3,7 @@ import builtins
 import json
 import os
 import tempfile
+import time
 import unittest
 
 from unittest import mock
@@ -206,3 +207,74 @@ class Py3FileWatcherTests(unittest.TestCase):
             watcher = file_watcher.FileWatcher(watched_file.name, parser=parser, newline="foo")
             with self.assertRaises(file_watcher.WatchedFileNotAvailableError):
                 watcher.get_data()
+
+    def test_use_inotify_falls_back_to_polling_when_unavailable(self):
+        with tempfile.NamedTemporaryFile() as watched_file:
+            watched_file.write(b"hello!")
+            watched_file.flush()
+            os.utime(watched_file.name, (1, 1))
+
+            with mock.patch.object(file_watcher, "inotify_simple", None):
+                watcher = file_watcher.FileWatcher(
+                    watched_file.name, parser=lambda x: x.read(), use_inotify=True
+                )
+
+            result = watcher.get_data()
+            self.assertEqual(result, "hello!")
+
+            watched_file.seek(0)
+            watched_file.write(b"breaking news: hello again!")
+            watched_file.flush()
+            os.utime(watched_file.name, (2, 2))
+
+            result = watcher.get_data()
+            self.assertEqual(result, "breaking news: hello again!")
+
+    def test_debounce_defers_reload_until_quiescent(self):
+        with tempfile.NamedTemporaryFile() as watched_file:
+            watched_file.write(b"hello!")
+            watched_file.flush()
+            os.utime(watched_file.name, (1, 1))
+
+            watcher = file_watcher.FileWatcher(
+                watched_file.name, parser=lambda x: x.read(), debounce=60
+            )
+            self.assertEqual(watcher.get_data(), "hello!")
+
+            # rewrite with a fresh mtime: still within the debounce window
+            watched_file.seek(0)
+            watched_file.write(b"partial write")
+            watched_file.flush()
+            self.assertEqual(watcher.get_data(), "hello!")
+
+            # once the mtime is old enough, the new contents are picked up
+            os.utime(watched_file.name, (2, 2))
+            self.assertEqual(watcher.get_data(), "partial write")
+
+    def test_inotify_debounced_change_not_lost(self):
+        with tempfile.NamedTemporaryFile() as watched_file:
+            watched_file.write(b"hello!")
+            watched_file.flush()
+            os.utime(watched_file.name, (1, 1))
+
+            watcher = file_watcher.FileWatcher(
+                watched_file.name, parser=lambda x: x.read(), debounce=60
+            )
+            self.assertEqual(watcher.get_data(), "hello!")
+
+            # rewrite with a fresh mtime so the debounce defers the reload
+            watched_file.seek(0)
+            watched_file.write(b"hello again!")
+            watched_file.flush()
+            self.assertEqual(watcher.get_data(), "hello!")
+
+            # simulate inotify having already consumed the event for that
+            # write: no further events will arrive and the periodic catch-up
+            # is not due, so only the pending-change flag can trigger a stat
+            fake_inotify = mock.Mock()
+            fake_inotify.read.return_value = []
+            watcher._inotify = fake_inotify
+            watcher._last_catchup = time.monotonic()
+
+            os.utime(watched_file.name, (2, 2))
+            self.assertEqual(watcher.get_data(), "hello again!")